@@ -74,6 +74,7 @@ def regenerate_umap_for_result(metadata_path: Path):
 
     # Update the metadata
     metadata['evaluation']['umap_coordinates'] = umap_coords
+    metadata['evaluation']['umap_coordinates_json'] = json.dumps(umap_coords)
 
     # Save the updated metadata
     with open(metadata_path, 'w', encoding='utf-8') as f:
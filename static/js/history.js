@@ -22,6 +22,7 @@
     const config = {
         csrfToken: getCookie('csrftoken'),
         pollInterval: 2000, // Poll every 2 seconds
+        hiddenPollInterval: 10000, // Back off while the tab is in the background
         activeJobs: new Map(), // Map of token -> polling timer
     };
 
@@ -46,7 +47,8 @@
     };
 
     const updateJobStatus = (token, row) => {
-        fetch(`/api/run-status/${token}/`, {
+        // The history table only shows progress, so skip the log tail
+        return fetch(`/api/run-status/${token}/?logs=0`, {
             headers: { 'Cache-Control': 'no-store' }
         })
             .then(response => response.json())
@@ -84,26 +86,33 @@
             });
     };
 
+    const scheduleNextPoll = (token, row) => {
+        if (!config.activeJobs.has(token)) return; // Polling was stopped
+
+        const delay = document.hidden ? config.hiddenPollInterval : config.pollInterval;
+        const timerId = setTimeout(() => {
+            updateJobStatus(token, row).finally(() => scheduleNextPoll(token, row));
+        }, delay);
+
+        config.activeJobs.set(token, timerId);
+    };
+
     const startPolling = (token, row) => {
         if (config.activeJobs.has(token)) return; // Already polling
 
-        // Initial update
-        updateJobStatus(token, row);
-
-        // Set up interval
-        const timerId = setInterval(() => {
-            updateJobStatus(token, row);
-        }, config.pollInterval);
+        config.activeJobs.set(token, null);
 
-        config.activeJobs.set(token, timerId);
+        // Initial update, then chain the next poll once the response arrives
+        updateJobStatus(token, row).finally(() => scheduleNextPoll(token, row));
     };
 
     const stopPolling = (token) => {
+        if (!config.activeJobs.has(token)) return;
         const timerId = config.activeJobs.get(token);
         if (timerId) {
-            clearInterval(timerId);
-            config.activeJobs.delete(token);
+            clearTimeout(timerId);
         }
+        config.activeJobs.delete(token);
     };
 
     // ========================================================================
@@ -135,7 +144,7 @@
     // Clean up on page unload
     window.addEventListener('beforeunload', () => {
         config.activeJobs.forEach((timerId, token) => {
-            clearInterval(timerId);
+            clearTimeout(timerId);
         });
         config.activeJobs.clear();
     });
@@ -3,7 +3,11 @@
 let umapData = null;
 let currentHoveredRow = null;
 let allDataRows = [];
+let datasetTotalRows = 0;
+let datasetNextCursor = null;
+let runToken = null;
 let currentDisplayMode = 'preview'; // 'preview' or 'all'
+const DATASET_PAGE_SIZE = 5000;
 
 // Initialize interactive UMAP plot with Plotly
 function initializeInteractiveUMAP(umapCoordinates, labels) {
@@ -183,14 +187,22 @@ function attachTableHoverListeners() {
 }
 
 // Toggle between preview (20 rows) and all data view
-function toggleDataView() {
+async function toggleDataView() {
     const tableBody = document.querySelector('.data-preview-table tbody');
     const toggleButton = document.getElementById('toggle-data-view');
 
     if (!tableBody || !toggleButton) return;
 
     if (currentDisplayMode === 'preview') {
-        // Show all data
+        // Fetch any pages not loaded yet, then show all data
+        toggleButton.disabled = true;
+        try {
+            await loadRemainingRows();
+        } catch (error) {
+            console.error('Error loading full dataset:', error);
+        } finally {
+            toggleButton.disabled = false;
+        }
         renderAllData();
         currentDisplayMode = 'all';
         toggleButton.textContent = 'Show Preview (20 rows)';
@@ -252,8 +264,8 @@ function updateRowCountDisplay() {
     const cardTitle = document.querySelector('.data-card .card-title');
     if (!cardTitle) return;
 
-    const totalRows = allDataRows.length;
-    const displayedRows = currentDisplayMode === 'preview' ? Math.min(20, totalRows) : totalRows;
+    const totalRows = datasetTotalRows || allDataRows.length;
+    const displayedRows = currentDisplayMode === 'preview' ? Math.min(20, totalRows) : allDataRows.length;
 
     if (currentDisplayMode === 'preview' && totalRows > 20) {
         cardTitle.innerHTML = `Preview (showing ${displayedRows} of ${totalRows} rows)`;
@@ -262,19 +274,36 @@ function updateRowCountDisplay() {
     }
 }
 
-// Load full dataset via API
+// Fetch one page of the dataset via API, resuming at the server's cursor
+async function fetchDatasetPage(cursor) {
+    const response = await fetch(`/api/dataset/${runToken}/?cursor=${cursor}&limit=${DATASET_PAGE_SIZE}`);
+    if (!response.ok) {
+        throw new Error('Failed to load dataset page');
+    }
+    return response.json();
+}
+
+// Load the pages after the first one; only needed for "View All"
+async function loadRemainingRows() {
+    while (datasetNextCursor !== null) {
+        const data = await fetchDatasetPage(datasetNextCursor);
+        allDataRows = allDataRows.concat(data.rows);
+        datasetNextCursor = data.rows.length ? data.next_cursor : null;
+    }
+}
+
+// Load the first page of the dataset via API
 async function loadFullDataset(token) {
+    runToken = token;
     try {
-        const response = await fetch(`/synthetic/api/dataset/${token}/`);
-        if (!response.ok) {
-            throw new Error('Failed to load full dataset');
-        }
-        const data = await response.json();
+        const data = await fetchDatasetPage(0);
         allDataRows = data.rows;
+        datasetTotalRows = data.total_rows;
+        datasetNextCursor = data.next_cursor;
 
         // Enable the "View All" button
         const toggleButton = document.getElementById('toggle-data-view');
-        if (toggleButton && allDataRows.length > 20) {
+        if (toggleButton && datasetTotalRows > 20) {
             toggleButton.disabled = false;
             toggleButton.style.display = 'inline-flex';
         }
@@ -291,7 +320,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // Get the run token from the page
     const tokenElement = document.querySelector('[data-run-token]');
-    const runToken = tokenElement ? tokenElement.getAttribute('data-run-token') : null;
+    const token = tokenElement ? tokenElement.getAttribute('data-run-token') : null;
 
     // Load UMAP data if available
     const umapDataElement = document.getElementById('umap-data');
@@ -308,8 +337,8 @@ document.addEventListener('DOMContentLoaded', function() {
     attachTableHoverListeners();
 
     // Load full dataset for "View All" functionality
-    if (runToken) {
-        loadFullDataset(runToken);
+    if (token) {
+        loadFullDataset(token);
     }
 
     // Attach click handler to toggle button
@@ -1,6 +1,16 @@
+from pathlib import Path
+
 from django.apps import AppConfig
+from django.conf import settings
+
+from .constants import MEDIA_SUBDIR
 
 
 class SyntheticConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'synthetic'
+
+    def ready(self) -> None:
+        # Create the run output directory once at startup so path lookups
+        # in views don't each issue a mkdir.
+        (Path(settings.MEDIA_ROOT) / MEDIA_SUBDIR).mkdir(parents=True, exist_ok=True)
@@ -1 +1,3 @@
 UPLOAD_MARKER = ".tabgraphsyn_upload.json"
+RUN_PIPELINE_TASK = "synthetic.run_pipeline"
+MEDIA_SUBDIR = "generated"
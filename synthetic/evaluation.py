@@ -1,6 +1,7 @@
 ﻿from __future__ import annotations
 
 import base64
+import importlib
 import json
 import math
 from pathlib import Path
@@ -42,8 +43,17 @@ def calculate_area(
     return (float(ratio) if not math.isnan(ratio) else math.nan, diffs)
 
 
-def evaluate_synthetic_run(dataset: str, table: str, synthetic_path: Path | str | None) -> dict[str, Any]:
-    """Run the evaluation pipeline for a generated dataset."""
+def evaluate_synthetic_run(
+    dataset: str,
+    table: str,
+    synthetic_path: Path | str | None,
+    synthetic_df: pd.DataFrame | None = None,
+) -> dict[str, Any]:
+    """Run the evaluation pipeline for a generated dataset.
+
+    ``synthetic_df`` may carry the already-loaded contents of ``synthetic_path``
+    so the UMAP projection does not parse the CSV a second time.
+    """
     if synthetic_path is None:
         return {
             'status': 'skipped',
@@ -112,7 +122,7 @@ def evaluate_synthetic_run(dataset: str, table: str, synthetic_path: Path | str
     }
 
     # Generate UMAP coordinates for interactive visualization
-    umap_coordinates = _generate_umap_coordinates(real_path, synthetic_path)
+    umap_coordinates = _generate_umap_coordinates(real_path, synthetic_path, synthetic_df)
 
     return {
         'status': 'success',
@@ -123,7 +133,25 @@ def evaluate_synthetic_run(dataset: str, table: str, synthetic_path: Path | str
     }
 
 
-def _generate_umap_coordinates(real_path: Path, synthetic_path: Path) -> list[dict[str, Any]] | None:
+def preload_umap() -> None:
+    """Import the UMAP stack ahead of time, if it is installed.
+
+    Called from the Celery worker's main process so pool children, which are
+    recycled after every run, inherit the modules instead of importing them
+    during evaluation.
+    """
+    for module in ('umap', 'sklearn.preprocessing'):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            return
+
+
+def _generate_umap_coordinates(
+    real_path: Path,
+    synthetic_path: Path,
+    synthetic_df: pd.DataFrame | None = None,
+) -> list[dict[str, Any]] | None:
     """
     Generate UMAP coordinates for both real and synthetic data for interactive visualization.
     Returns a list of coordinate dictionaries with x, y, type, and index.
@@ -135,7 +163,8 @@ def _generate_umap_coordinates(real_path: Path, synthetic_path: Path) -> list[di
 
         # Load real and synthetic data
         real_df = pd.read_csv(real_path)
-        synthetic_df = pd.read_csv(synthetic_path)
+        if synthetic_df is None:
+            synthetic_df = pd.read_csv(synthetic_path)
 
         # Select only numeric columns for UMAP
         real_numeric = real_df.select_dtypes(include=[np.number])
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Any
+
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+_USE_SENDFILE = hasattr(os, 'sendfile') and sys.platform.startswith('linux')
+_USE_COPY_FILE_RANGE = hasattr(os, 'copy_file_range')
+
+
+def copy_file(source: Path | str, target: Path) -> None:
+    """Copy ``source`` to ``target`` inside the kernel where possible.
+
+    ``copy_file_range`` lets the filesystem clone or copy the extents without
+    a round trip through user space (a reflink on CoW filesystems); sendfile
+    and a large buffered copy are the fallbacks.
+    """
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        size = os.fstat(src.fileno()).st_size
+        if not (_USE_COPY_FILE_RANGE and _kernel_copy(os.copy_file_range, src, dst, size)):
+            if not (_USE_SENDFILE and _kernel_copy(os.sendfile, src, dst, size)):
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+                shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+    shutil.copystat(source, target)
+
+
+def _kernel_copy(copy: Any, src: Any, dst: Any, size: int) -> bool:
+    """Run a sendfile-style copy loop; return False if the kernel refuses it.
+
+    Some filesystems report 0 bytes copied before the end of the file (e.g.
+    FUSE or procfs-like sources); the rest is then copied through user space.
+    """
+    offset = 0
+    try:
+        while offset < size:
+            if copy is os.sendfile:
+                sent = copy(dst.fileno(), src.fileno(), offset, size - offset)
+            else:
+                sent = copy(src.fileno(), dst.fileno(), size - offset, offset, offset)
+            if sent == 0:
+                break
+            offset += sent
+    except OSError:
+        if offset:
+            raise
+        return False
+    if offset < size:
+        # Position both files explicitly: copy_file_range leaves them alone,
+        # but sendfile advances the target's offset as it writes.
+        src.seek(offset)
+        dst.seek(offset)
+        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+    return True
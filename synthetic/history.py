@@ -4,12 +4,30 @@ import logging
 from typing import Any
 
 from django.utils import timezone
+from pymongo import ASCENDING, DESCENDING
 from pymongo.errors import PyMongoError
 
 from accounts.mongo import get_runs_collection
 
 logger = logging.getLogger(__name__)
 
+# Only the fields the history table renders; evaluation payloads (UMAP points,
+# base64 plots) stay on the server.
+HISTORY_LIST_FIELDS = (
+    'token',
+    'dataset',
+    'table',
+    'data_source',
+    'generated_rows',
+    'requested_at',
+    'started_at',
+    'finished_at',
+)
+# Metadata kept in the run's JSON sidecar but not copied into MongoDB
+SIDECAR_ONLY_FIELDS = frozenset({'logs', 'preview_headers', 'preview_rows'})
+
+_history_index_ready = False
+
 
 def store_run_history(
     metadata: dict[str, Any],
@@ -18,7 +36,10 @@ def store_run_history(
     started_at: str | None,
     finished_at: str | None,
 ) -> None:
-    document = dict(metadata)
+    # The captured command output and the cached result preview stay in the
+    # sidecar; the history pages never read them and the logs can dwarf the
+    # rest of the document.
+    document = {key: value for key, value in metadata.items() if key not in SIDECAR_ONLY_FIELDS}
     document['owner'] = owner or {}
     document['owner_username'] = (owner or {}).get('username')
     document['owner_display_name'] = (
@@ -39,8 +60,9 @@ def store_run_history(
 def fetch_runs_for_user(username: str, limit: int = 50) -> list[dict[str, Any]]:
     try:
         collection = get_runs_collection()
+        _ensure_history_index(collection)
         cursor = (
-            collection.find({'owner_username': username})
+            collection.find({'owner_username': username}, dict.fromkeys(HISTORY_LIST_FIELDS, 1))
             .sort('finished_at', -1)
             .limit(limit)
         )
@@ -51,3 +73,16 @@ def fetch_runs_for_user(username: str, limit: int = 50) -> list[dict[str, Any]]:
         return results
     except PyMongoError as exc:
         raise RuntimeError(f'Unable to load run history: {exc}') from exc
+
+
+def _ensure_history_index(collection: Any) -> None:
+    """Create the (owner, finished_at) index the history query sorts on, once per process."""
+    global _history_index_ready
+    if _history_index_ready:
+        return
+    try:
+        collection.create_index([('owner_username', ASCENDING), ('finished_at', DESCENDING)])
+    except PyMongoError as exc:
+        # The query still works without it (e.g. a read-only user); don't retry per request
+        logger.warning('Could not create the run history index: %s', exc)
+    _history_index_ready = True
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+import redis
+from django.conf import settings
+
+from .jsonio import dumps_bytes, loads
+
+logger = logging.getLogger(__name__)
+
+STATUS_KEY_PREFIX = 'tabgraphsyn:job:'
+STATUS_TTL_SECONDS = 86400
+MAX_CONNECTIONS = 32
+
+_pool: redis.ConnectionPool | None = None
+
+
+def _client() -> redis.Redis | None:
+    global _pool
+    if _pool is None:
+        url = getattr(settings, 'JOB_STATUS_REDIS_URL', None) or settings.CELERY_BROKER_URL
+        if not url.startswith(('redis://', 'rediss://', 'unix://')):
+            return None
+        _pool = redis.ConnectionPool.from_url(
+            url,
+            max_connections=MAX_CONNECTIONS,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+        )
+    return redis.Redis(connection_pool=_pool)
+
+
+def publish_job_status(token: str, state: str, meta: dict[str, Any]) -> None:
+    """Store the latest task state so status polls can skip the result backend."""
+    try:
+        client = _client()
+        if client is not None:
+            client.set(
+                STATUS_KEY_PREFIX + token,
+                dumps_bytes({'state': state, 'meta': meta, 'published_at': time.time()}),
+                ex=STATUS_TTL_SECONDS,
+            )
+    except redis.RedisError as exc:
+        logger.debug('Failed to publish job status for %s: %s', token, exc)
+
+
+def read_job_status(token: str) -> dict[str, Any] | None:
+    """Return the last published ``{'state', 'meta', 'published_at'}`` snapshot, or None if unavailable."""
+    try:
+        client = _client()
+        raw = client.get(STATUS_KEY_PREFIX + token) if client is not None else None
+    except redis.RedisError as exc:
+        logger.debug('Failed to read job status for %s: %s', token, exc)
+        return None
+    if raw is None:
+        return None
+    return loads(raw)
@@ -147,14 +147,14 @@ def _progress_for_stage(stage: str) -> int:
 
 
 def _stage_from_line(line: str) -> Optional[str]:
-    upper = line.strip().upper()
-    if "PREPROCESSING DATA" in upper or "PREPROCESS" in upper:
+    upper = line.upper()
+    if "PREPROCESS" in upper:
         return "preprocessing"
-    if "TRAINING MODELS" in upper or ("TRAINING" in upper and "MODEL" in upper):
+    if "TRAINING" in upper and "MODEL" in upper:
         return "training"
-    if "SAMPLING DATA" in upper or ("SAMPLING" in upper and "DATA" in upper):
+    if "SAMPLING" in upper and "DATA" in upper:
         return "sampling"
-    if "PIPELINE COMPLETED" in upper or "COMPLETED SUCCESSFULLY" in upper:
+    if "COMPLETED" in upper and ("PIPELINE COMPLETED" in upper or "COMPLETED SUCCESSFULLY" in upper):
         return "completed"
     return None
 
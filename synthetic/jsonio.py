@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _stdlib_default(value: Any) -> Any:
+    # numpy scalars and arrays, which orjson serializes natively
+    if type(value).__module__ == 'numpy' and hasattr(value, 'tolist'):
+        return _finite(value.tolist())
+    return _default(value)
+
+
+def _finite(value: Any) -> Any:
+    """Replace NaN and infinities with None, as orjson writes them as null."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def dumps_bytes(payload: Any) -> bytes:
+    """Serialize ``payload`` to compact UTF-8 JSON, using orjson when available.
+
+    Filesystem paths are written as their string form, non-string dict keys
+    are converted to strings and NaN/infinity become null, so the output is
+    valid JSON and the same with or without orjson.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        _finite(payload),
+        separators=(',', ':'),
+        ensure_ascii=False,
+        allow_nan=False,
+        default=_stdlib_default,
+    ).encode('utf-8')
+
+
+def dumps(payload: Any) -> str:
+    """Serialize ``payload`` to a compact JSON string."""
+    return dumps_bytes(payload).decode('utf-8')
+
+
+def loads(raw: bytes | str) -> Any:
+    """Parse JSON from bytes or str, using orjson when available.
+
+    Files written by the stdlib encoder (the pipeline's epoch logs, older
+    sidecars) may contain bare ``NaN``/``Infinity`` tokens, which orjson
+    rejects; those are parsed with ``json`` instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def write_json(path: Path, payload: Any) -> None:
+    """Atomically replace ``path`` with ``payload`` encoded as compact JSON."""
+    write_json_bytes(path, dumps_bytes(payload))
+
+
+def write_json_bytes(path: Path, data: bytes) -> None:
+    """Atomically replace ``path`` with already-encoded JSON ``data``."""
+    with atomic_writer(path) as stream:
+        stream.write(data)
+
+
+@contextmanager
+def atomic_writer(path: Path) -> Iterator[BinaryIO]:
+    """Yield a binary stream whose contents replace ``path`` when the block exits.
+
+    The bytes go to a temporary file in the same directory which is then
+    renamed over the target, so readers never observe a partially written file.
+    If the block raises, the temporary file is removed and ``path`` is untouched.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as stream:
+            yield stream
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
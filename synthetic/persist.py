@@ -0,0 +1,244 @@
+"""
+Run persistence shared by the Celery worker and the views.
+
+The worker writes a finished run's CSV and JSON sidecar under
+``MEDIA_ROOT/generated`` and records it in the run history; the views read
+the same files back by token.
+"""
+from __future__ import annotations
+
+import csv
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterator
+
+from django.conf import settings
+from django.utils import timezone
+
+from .constants import MEDIA_SUBDIR
+from .fileops import copy_file
+from .history import store_run_history
+from .jsonio import atomic_writer, dumps, dumps_bytes
+from .tabgraphsyn import PipelineParameters
+
+PREVIEW_ROWS = 20
+
+_PERSIST_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='persist-run')
+_BASE_DIR = Path(settings.BASE_DIR)
+_GENERATED_DIR = Path(settings.MEDIA_ROOT) / MEDIA_SUBDIR
+
+
+def _generated_dir() -> Path:
+    # Created once in SyntheticConfig.ready(); persist_run still ensures the
+    # parent exists before writing in case the media tree was removed.
+    return _GENERATED_DIR
+
+
+@lru_cache(maxsize=1024)
+def run_metadata_path(token: str) -> Path:
+    return _generated_dir() / f'{token}.json'
+
+
+@lru_cache(maxsize=1024)
+def run_data_path(token: str) -> Path:
+    return _generated_dir() / f'{token}.csv'
+
+
+def epoch_metrics_log_path(dataset: str, table: str, run_name: str) -> Path | None:
+    """Locate the most recent epoch-metrics log for a dataset/table/run."""
+    logs_dir = _BASE_DIR / 'logs' / 'training_metrics'
+    try:
+        dir_mtime_ns = logs_dir.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    found = _latest_epoch_metrics_log(str(logs_dir), dataset, table, run_name, dir_mtime_ns)
+    return Path(found) if found else None
+
+
+@lru_cache(maxsize=128)
+def _latest_epoch_metrics_log(
+    logs_dir_str: str, dataset: str, table: str, run_name: str, dir_mtime_ns: int
+) -> str | None:
+    # Keyed on the directory mtime: new log files bump it and invalidate the entry.
+    logs_dir = Path(logs_dir_str)
+
+    # Build search pattern for this dataset/table/run
+    table_factor = f"{table}_factor" if not table.endswith('_factor') else table
+    search_pattern = f"{dataset}_{table_factor}_{run_name}_*.json"
+
+    # Find matching log files
+    matching_files = list(logs_dir.glob(search_pattern))
+
+    if not matching_files:
+        # Try without _factor suffix
+        search_pattern_alt = f"{dataset}_{table}_{run_name}_*.json"
+        matching_files = list(logs_dir.glob(search_pattern_alt))
+
+    if not matching_files:
+        return None
+
+    # Use the most recent file
+    return str(max(matching_files, key=lambda p: p.stat().st_mtime))
+
+
+def build_run_metadata(
+    *,
+    params: PipelineParameters,
+    pipeline_result: Any,
+    token: str,
+    generated_rows: int | None,
+    data_source: str,
+    extra_metadata: dict[str, Any] | None = None,
+    owner: dict[str, Any] | None = None,
+    started_at: str | None = None,
+    finished_at: str | None = None,
+) -> dict[str, Any]:
+    started_at = started_at or timezone.now().isoformat()
+    log_path = pipeline_result.log_path
+    output_csv = pipeline_result.output_csv
+    metadata = {
+        'token': token,
+        'dataset': params.dataset,
+        'table': params.table,
+        'run_name': params.run_name,
+        'requested_at': started_at,
+        'started_at': started_at,
+        'finished_at': finished_at,
+        'num_samples': params.num_samples,
+        'random_seed': params.seed,
+        'factor_missing': params.factor_missing,
+        'positional_enc': params.positional_enc,
+        'retrain_vae': params.retrain_vae,
+        'skip_preprocessing': params.skip_preprocessing,
+        'model_type': params.model_type,
+        'normalization': params.normalization,
+        'gnn_hidden': params.gnn_hidden,
+        'denoising_steps': params.denoising_steps,
+        'epochs_vae': params.epochs_vae,
+        'epochs_gnn': params.epochs_gnn,
+        'epochs_diff': params.epochs_diff,
+        'generated_rows': generated_rows,
+        'data_source': data_source,
+        'log_file': str(log_path) if log_path else None,
+        'output_csv': str(output_csv) if output_csv else None,
+        'logs': [
+            {
+                'description': command.description,
+                'command': command.command,
+                'output': command.output,
+            }
+            for command in pipeline_result.commands
+        ],
+    }
+    if owner:
+        owner_block = _owner_block(owner)
+        metadata['owner'] = owner_block
+        metadata['owner_username'] = owner_block['username']
+    if output_csv:
+        # Cache the result page preview so rendering it doesn't reopen the CSV
+        metadata['preview_headers'], metadata['preview_rows'] = read_csv_rows(output_csv, 0, PREVIEW_ROWS)
+    if extra_metadata:
+        metadata.update(extra_metadata)
+    _encode_umap_coordinates(metadata)
+    return metadata
+
+
+def _owner_block(owner: dict[str, Any]) -> dict[str, Any]:
+    username = owner.get('username')
+    return {
+        'username': username,
+        'email': owner.get('email'),
+        'full_name': owner.get('full_name') or owner.get('name') or username,
+        'roles': owner.get('roles', []),
+    }
+
+
+def _encode_umap_coordinates(metadata: dict[str, Any]) -> None:
+    """Store the UMAP points pre-serialized so result_view can embed them as-is."""
+    evaluation = metadata.get('evaluation')
+    if not isinstance(evaluation, dict):
+        return
+    umap_coords = evaluation.get('umap_coordinates')
+    if umap_coords:
+        evaluation['umap_coordinates_json'] = dumps(umap_coords)
+
+
+def read_csv_rows(csv_path: Path | str, offset: int, limit: int) -> tuple[list[str], list[list[str]]]:
+    """Return the header and ``limit`` data rows starting at ``offset``, as raw strings.
+
+    Display paths only need the cell text, so the C ``csv`` reader is used
+    directly; no DataFrame or dtype inference is involved and reading stops
+    as soon as the requested slice has been collected.
+    """
+    with open(csv_path, newline='', encoding='utf-8') as stream:
+        reader = filter(None, csv.reader(stream))
+        headers = next(reader, [])
+        rows = list(islice(reader, offset, offset + limit))
+    return headers, rows
+
+
+def count_csv_rows(csv_path: Path | str) -> int:
+    """Count data rows in a CSV the same way ``read_csv_rows`` reads them.
+
+    Blank lines are skipped and quoted fields may span lines, matching both
+    the dataset API's page reader and the ``len(DataFrame)`` stored as ``generated_rows``.
+    """
+    with open(csv_path, newline='', encoding='utf-8') as stream:
+        rows = sum(1 for _ in filter(None, csv.reader(stream)))
+    return max(rows - 1, 0)
+
+
+def _iter_metadata_json(metadata: dict[str, Any]) -> Iterator[bytes]:
+    """Encode run metadata piecewise, one captured command at a time.
+
+    The command outputs make up most of the document, so emitting them
+    separately keeps the largest encoded buffer to a single command's log
+    rather than the whole file.
+    """
+    logs = metadata.get('logs')
+    if not logs:
+        yield dumps_bytes(metadata)
+        return
+    head = dumps_bytes({key: value for key, value in metadata.items() if key != 'logs'})
+    yield head[:-1]
+    yield b',"logs":[' if len(head) > 2 else b'"logs":['
+    for index, entry in enumerate(logs):
+        if index:
+            yield b','
+        yield dumps_bytes(entry)
+    yield b']}'
+
+
+def persist_run(
+    token: str,
+    pipeline_result: Any,
+    metadata: dict[str, Any],
+    *,
+    owner: dict[str, Any] | None = None,
+    started_at: str | None = None,
+    finished_at: str | None = None,
+) -> None:
+    metadata.setdefault('started_at', started_at)
+    metadata.setdefault('finished_at', finished_at)
+    csv_target = run_data_path(token)
+    meta_target = run_metadata_path(token)
+    meta_target.parent.mkdir(parents=True, exist_ok=True)
+    copy_future: Future[None] | None = None
+    if pipeline_result.output_csv is not None:
+        # This has to be a copy: the pipeline writes to a fixed per-dataset run
+        # directory that the next run truncates in place, and the evaluation
+        # paths recorded in the metadata still point at it. A rename or hard
+        # link would break both; copy_file_range gets reflinks where the
+        # filesystem supports them.
+        copy_future = _PERSIST_EXECUTOR.submit(copy_file, pipeline_result.output_csv, csv_target)
+    # Stream the metadata to a temp file while the CSV copy runs; it only
+    # replaces the sidecar once the copy has finished, so the sidecar never
+    # points at a partial CSV.
+    with atomic_writer(meta_target) as stream:
+        for chunk in _iter_metadata_json(metadata):
+            stream.write(chunk)
+        if copy_future is not None:
+            copy_future.result()
+    store_run_history(metadata, owner=owner, started_at=metadata.get('started_at'), finished_at=metadata.get('finished_at'))
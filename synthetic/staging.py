@@ -5,15 +5,18 @@ import re
 import shutil
 from dataclasses import dataclass
 from pathlib import Path
+from secrets import token_hex
 from typing import Any
-from uuid import uuid4
 
 import numpy as np
 import pandas as pd
 from django.conf import settings
+from django.core.files.move import file_move_safe
 from django.core.files.uploadedfile import UploadedFile
 
 from .constants import UPLOAD_MARKER
+from .fileops import COPY_BUFFER_SIZE, copy_file
+from .jsonio import loads
 
 
 STAGING_ROOT = Path(settings.MEDIA_ROOT) / 'uploads'
@@ -49,9 +52,14 @@ def _slugify(raw: str, fallback: str) -> str:
 
 
 def _write_upload(upload: UploadedFile, destination: Path) -> None:
+    # Large uploads are already spooled to disk by Django; rename the temp
+    # file into place instead of streaming it through a second copy.
+    if hasattr(upload, 'temporary_file_path'):
+        file_move_safe(upload.temporary_file_path(), str(destination))
+        return
+    upload.seek(0)
     with destination.open('wb') as target:
-        for chunk in upload.chunks():
-            target.write(chunk)
+        shutil.copyfileobj(upload, target, COPY_BUFFER_SIZE)
 
 
 def _infer_column_type(series: pd.Series) -> str:
@@ -105,7 +113,7 @@ def stage_upload(upload: UploadedFile, *, dataset_name: str | None = None, table
             'File must be a CSV file.'
         )
 
-    token = uuid4().hex
+    token = token_hex(16)
     _ensure_dir(STAGING_ROOT)
     stage_root = STAGING_ROOT / token
     stage_root.mkdir(parents=True, exist_ok=False)
@@ -200,8 +208,7 @@ def load_stage(token: str) -> StageData:
     source_path = stage_root / 'source.csv'
     if not profile_path.exists() or not source_path.exists():
         raise FileNotFoundError('Staged upload not found.')
-    with profile_path.open('r', encoding='utf-8') as stream:
-        profile = json.load(stream)
+    profile = loads(profile_path.read_bytes())
     return StageData(token=token, root=stage_root, source_path=source_path, profile=profile)
 
 
@@ -311,8 +318,8 @@ def materialize_to_pipeline(
     dataset_root.mkdir(parents=True, exist_ok=True)
 
     destination_csv = dataset_root / f'{table_name}.csv'
-    shutil.copy2(stage.source_path, destination_csv)
-    shutil.copy2(metadata_path, dataset_root / 'metadata.json')
+    copy_file(stage.source_path, destination_csv)
+    copy_file(metadata_path, dataset_root / 'metadata.json')
 
     marker_payload = {
         'token': stage.token,
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import os
 import subprocess
 import sys
@@ -12,6 +11,7 @@ from typing import Callable
 
 from django.conf import settings
 from .constants import UPLOAD_MARKER
+from .jsonio import loads
 
 BASE_DIR = Path(settings.BASE_DIR)
 DATA_ROOT = BASE_DIR / 'src' / 'data'
@@ -46,7 +46,7 @@ class PipelineParameters:
     eval_samples: int = 500
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CommandResult:
     description: str
     command: list[str]
@@ -105,8 +105,7 @@ def tables_for_dataset(dataset: str) -> list[str]:
     metadata_path = DATA_ROOT / 'original' / dataset / 'metadata.json'
     if not metadata_path.exists():
         return []
-    with metadata_path.open('r', encoding='utf-8') as fp:
-        metadata = json.load(fp)
+    metadata = loads(metadata_path.read_bytes())
     tables = metadata.get('tables')
     if isinstance(tables, dict):
         return sorted(tables.keys())
@@ -6,17 +6,28 @@ It replaces the threading approach with a production-ready task queue system.
 """
 from __future__ import annotations
 
-import json
+import time
 import traceback
+from secrets import token_hex
 from typing import Any
+
+import pandas as pd
 from celery import shared_task
+from celery.signals import worker_init
 from django.utils import timezone
 
+from .constants import RUN_PIPELINE_TASK
 from .tabgraphsyn import PipelineParameters, run_pipeline as execute_pipeline
-from .evaluation import evaluate_synthetic_run
+from .evaluation import EVAL_FUNC_IMPORT_ERROR, evaluate_synthetic_run, preload_umap
+from .job_status import publish_job_status
+from .persist import build_run_metadata, count_csv_rows, epoch_metrics_log_path, persist_run
+
+LOG_TAIL_LINES = 50
+LOG_REFRESH_SECONDS = 5.0
+TRACEBACK_TAIL_LINES = 20
 
 
-@shared_task(bind=True, name='synthetic.run_pipeline')
+@shared_task(bind=True, name=RUN_PIPELINE_TASK)
 def run_pipeline_task(
     self,
     job_token: str,
@@ -42,21 +53,6 @@ def run_pipeline_task(
             - run_token: Token for accessing the generated data
             - error: Error message if failed
     """
-    from pathlib import Path
-    from uuid import uuid4
-    import pandas as pd
-    import shutil
-    from django.conf import settings
-
-    # Import here to avoid circular imports
-    from .views import (
-        _data_path,
-        _metadata_path,
-        _build_run_metadata,
-        _generated_dir,
-    )
-    from .history import store_run_history
-
     # Reconstruct PipelineParameters from dictionary
     params = PipelineParameters(**params_dict)
 
@@ -68,7 +64,8 @@ def run_pipeline_task(
     description = prepared_metadata.get('description', 'Pipeline run')
 
     # Update task state to 'STARTING'
-    self.update_state(
+    _update_state(
+        self,
         state='PROGRESS',
         meta={
             'stage': 'starting',
@@ -81,33 +78,41 @@ def run_pipeline_task(
     try:
         # Callback function to capture pipeline output and update task state
         logs = []
+        published = {'stage': 'preprocessing', 'at': time.monotonic()}
 
         def status_callback(line: str) -> None:
             """Capture pipeline log output"""
             logs.append(line.rstrip('\n'))
 
-            # Parse stage from log line and update task state
-            stage = _parse_stage_from_log(line)
-            if stage:
-                progress = _progress_for_stage(stage)
-                self.update_state(
-                    state='PROGRESS',
-                    meta={
-                        'stage': stage,
-                        'message': _stage_message(stage),
-                        'progress': progress,
-                        'logs': logs[-50:],  # Keep last 50 log lines
-                    }
-                )
+            # Publish immediately on a stage transition; otherwise only refresh
+            # the log tail every LOG_REFRESH_SECONDS so repeated markers (one per
+            # epoch, for instance) don't rewrite the result backend each line.
+            stage = _parse_stage_from_log(line) or published['stage']
+            now = time.monotonic()
+            if stage == published['stage'] and now - published['at'] < LOG_REFRESH_SECONDS:
+                return
+            published['stage'] = stage
+            published['at'] = now
+            _update_state(
+                self,
+                state='PROGRESS',
+                meta={
+                    'stage': stage,
+                    'message': _stage_message(stage),
+                    'progress': _progress_for_stage(stage),
+                    'logs': logs[-LOG_TAIL_LINES:],
+                }
+            )
 
         # Update to preprocessing stage
-        self.update_state(
+        _update_state(
+            self,
             state='PROGRESS',
             meta={
                 'stage': 'preprocessing',
                 'message': 'Preprocessing data',
                 'progress': 15,
-                'logs': logs,
+                'logs': logs[-LOG_TAIL_LINES:],
             }
         )
 
@@ -115,47 +120,58 @@ def run_pipeline_task(
         pipeline_result = execute_pipeline(params, status_callback=status_callback)
 
         # Generate run token for this output
-        run_token = uuid4().hex
-
-        # Read generated data to count rows
-        generated_rows = None
-        if pipeline_result.output_csv is not None:
-            df = pd.read_csv(pipeline_result.output_csv)
-            generated_rows = int(len(df))
+        run_token = token_hex(16)
 
         # Update to evaluation stage
-        self.update_state(
+        _update_state(
+            self,
             state='PROGRESS',
             meta={
                 'stage': 'evaluation',
                 'message': 'Running evaluation',
                 'progress': 90,
-                'logs': logs,
+                'logs': logs[-LOG_TAIL_LINES:],
             }
         )
 
+        # Load the generated CSV once; the row count and the UMAP projection
+        # both work from this frame instead of parsing the file separately.
+        synthetic_df = None
+        generated_rows = None
+        if pipeline_result.output_csv is not None:
+            synthetic_df, generated_rows = _load_synthetic_output(pipeline_result.output_csv)
+
         # Run evaluation
         evaluation_payload = evaluate_synthetic_run(
             dataset=params.dataset,
             table=params.table,
             synthetic_path=pipeline_result.output_csv,
+            synthetic_df=synthetic_df,
         )
         extra_metadata['evaluation'] = evaluation_payload
+        del synthetic_df
 
         # Update to finalizing stage
-        self.update_state(
+        _update_state(
+            self,
             state='PROGRESS',
             meta={
                 'stage': 'finalizing',
                 'message': 'Saving outputs',
                 'progress': 95,
-                'logs': logs,
+                'logs': logs[-LOG_TAIL_LINES:],
             }
         )
 
+        # Record the epoch-metrics log so the result page doesn't have to search for it
+        if params.enable_epoch_eval:
+            epoch_log = epoch_metrics_log_path(params.dataset, params.table, params.run_name)
+            if epoch_log is not None:
+                extra_metadata['epoch_metrics_log'] = str(epoch_log)
+
         # Save outputs
         finished_at = timezone.now().isoformat()
-        metadata_payload = _build_run_metadata(
+        metadata_payload = build_run_metadata(
             params=params,
             pipeline_result=pipeline_result,
             token=run_token,
@@ -168,7 +184,7 @@ def run_pipeline_task(
         )
 
         # Persist run to disk
-        _persist_run(
+        persist_run(
             run_token,
             pipeline_result,
             metadata_payload,
@@ -178,29 +194,33 @@ def run_pipeline_task(
         )
 
         # Return success result
-        return {
+        result = {
             'status': 'completed',
             'run_token': run_token,
             'stage': 'completed',
             'message': 'Pipeline run completed',
             'progress': 100,
-            'logs': logs,
+            'logs': logs[-LOG_TAIL_LINES:],
         }
+        publish_job_status(self.request.id, 'SUCCESS', result)
+        return result
 
     except Exception as exc:
-        # Log the full traceback
-        error_traceback = traceback.format_exc()
+        # Keep only the innermost frames; the traceback travels in its own
+        # field rather than being appended to the log tail as well.
+        tb_lines = list(traceback.TracebackException.from_exception(exc).format())
+        error_traceback = ''.join(tb_lines[-TRACEBACK_TAIL_LINES:])
         logs.append(f'ERROR: {exc}')
-        logs.append(error_traceback)
 
         # Update task state to failed
-        self.update_state(
+        _update_state(
+            self,
             state='FAILURE',
             meta={
                 'stage': 'failed',
                 'message': str(exc),
                 'progress': 0,
-                'logs': logs,
+                'logs': logs[-LOG_TAIL_LINES:],
                 'error': str(exc),
                 'traceback': error_traceback,
             }
@@ -210,65 +230,42 @@ def run_pipeline_task(
         raise
 
 
-def _persist_run(
-    token: str,
-    pipeline_result: Any,
-    metadata: dict[str, Any],
-    *,
-    owner: dict[str, Any] | None = None,
-    started_at: str | None = None,
-    finished_at: str | None = None,
-) -> None:
-    """
-    Persist the pipeline run results to disk and database.
+def _update_state(task: Any, *, state: str, meta: dict[str, Any]) -> None:
+    """Record task progress in the result backend and the status cache."""
+    task.update_state(state=state, meta=meta)
+    publish_job_status(task.request.id, state, meta)
 
-    Args:
-        token: Unique token for this run
-        pipeline_result: Result object from pipeline execution
-        metadata: Run metadata dictionary
-        owner: User who owns this run
-        started_at: ISO timestamp when run started
-        finished_at: ISO timestamp when run finished
+
+def _load_synthetic_output(csv_path: Any) -> tuple[pd.DataFrame | None, int]:
+    """Return the generated frame for evaluation, if it will run, and its row count.
+
+    Without the evaluation dependencies nothing consumes the frame, so the
+    rows are counted with a newline scan instead of a full parse.
     """
-    import shutil
-    from django.conf import settings
-    from pathlib import Path
-
-    # Import here to avoid circular imports
-    from .views import _data_path, _metadata_path, _generated_dir
-    from .history import store_run_history
-
-    # Copy generated CSV to media directory
-    if pipeline_result.output_csv is not None:
-        csv_target = _data_path(token)
-        csv_target.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(pipeline_result.output_csv, csv_target)
-
-    # Save metadata
-    metadata.setdefault('started_at', started_at)
-    metadata.setdefault('finished_at', finished_at)
-    with open(_metadata_path(token), 'w', encoding='utf-8') as meta_file:
-        json.dump(metadata, meta_file, indent=2)
-
-    # Store in MongoDB history
-    store_run_history(
-        metadata,
-        owner=owner,
-        started_at=metadata.get('started_at'),
-        finished_at=metadata.get('finished_at'),
-    )
+    if EVAL_FUNC_IMPORT_ERROR is not None:
+        return None, count_csv_rows(csv_path)
+    synthetic_df = pd.read_csv(csv_path)
+    return synthetic_df, int(len(synthetic_df))
+
+
+@worker_init.connect
+def _preload_pipeline_imports(**kwargs: Any) -> None:
+    """Load the evaluation imports once in the parent before the pool forks."""
+    preload_umap()
 
 
 def _parse_stage_from_log(line: str) -> str | None:
     """Parse pipeline stage from log line"""
-    upper = line.strip().upper()
-    if 'PREPROCESSING DATA' in upper or 'PREPROCESS' in upper:
+    # Each branch leads with the single keyword every marker for that stage
+    # contains, so ordinary output lines cost one substring scan per stage.
+    upper = line.upper()
+    if 'PREPROCESS' in upper:
         return 'preprocessing'
-    if 'TRAINING MODELS' in upper or ('TRAINING' in upper and 'MODEL' in upper):
+    if 'TRAINING' in upper and 'MODEL' in upper:
         return 'training'
-    if 'SAMPLING DATA' in upper or ('SAMPLING' in upper and 'DATA' in upper):
+    if 'SAMPLING' in upper and 'DATA' in upper:
         return 'sampling'
-    if 'PIPELINE COMPLETED' in upper or 'COMPLETED SUCCESSFULLY' in upper:
+    if 'COMPLETED' in upper and ('PIPELINE COMPLETED' in upper or 'COMPLETED SUCCESSFULLY' in upper):
         return 'completed'
     return None
 
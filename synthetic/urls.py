@@ -4,15 +4,18 @@ from . import views
 
 app_name = 'synthetic'
 
+# Patterns are resolved in order, so the endpoint the browser polls while a
+# job runs is listed first; none of the patterns overlap.
 urlpatterns = [
+    path('api/run-status/<str:token>/', views.api_job_status, name='api-run-status'),
     path('', views.upload_view, name='upload'),
     path('history/', views.history_view, name='history'),
+    path('result/<str:token>/', views.result_view, name='result'),
+    path('api/dataset/<str:token>/', views.api_dataset_view, name='api-dataset'),
+    path('api/epoch-metrics/<str:token>/', views.api_epoch_metrics_view, name='api-epoch-metrics'),
     path('api/stage-upload/', views.api_stage_upload, name='api-stage-upload'),
     path('api/finalize-metadata/', views.api_finalize_metadata, name='api-finalize-metadata'),
     path('api/start-run/', views.api_start_run, name='api-start-run'),
-    path('api/run-status/<str:token>/', views.api_job_status, name='api-run-status'),
-    path('api/dataset/<str:token>/', views.api_dataset_view, name='api-dataset'),
-    path('result/<str:token>/', views.result_view, name='result'),
     path('download/<str:token>/', views.download_view, name='download'),
     path('download/plot/<str:token>/', views.download_plot, name='download-plot'),
 ]
@@ -1,26 +1,34 @@
 from __future__ import annotations
 
-import json
+import csv
 import logging
-import shutil
-from dataclasses import dataclass
+import mimetypes
+import os
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Optional
-from uuid import uuid4
+from typing import Any, BinaryIO, Iterator, Optional
+from urllib.parse import quote
 
-import pandas as pd
+from celery import current_app
 from celery.result import AsyncResult
+from celery.states import READY_STATES
 from django.conf import settings
-from django.http import FileResponse, Http404, HttpRequest, HttpResponse, JsonResponse
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
 from django.utils import timezone
+from django.utils.http import content_disposition_header
+from django.views.decorators.gzip import gzip_page
 from django.views.decorators.http import require_POST
 
 # Authentication decorators removed - using session-based tracking instead
 
+from .constants import RUN_PIPELINE_TASK
 from .forms import SyntheticDataForm
-from .tasks import run_pipeline_task
 from .staging import (
     build_metadata_from_profile,
     load_stage,
@@ -31,17 +39,28 @@ from .staging import (
     update_stage_profile,
 )
 from .tabgraphsyn import (
-    PipelineError,
+    DATA_ROOT,
     PipelineParameters,
     available_datasets,
-    run_pipeline as execute_pipeline,
     tables_for_dataset,
 )
-from .evaluation import evaluate_synthetic_run
-from .history import fetch_runs_for_user, store_run_history
+from .history import fetch_runs_for_user
+from .job_status import read_job_status
+from .jsonio import dumps, dumps_bytes, loads
+from .persist import (
+    PREVIEW_ROWS,
+    count_csv_rows,
+    epoch_metrics_log_path,
+    read_csv_rows,
+    run_data_path,
+    run_metadata_path,
+)
 from . import job_tracker
 
-MEDIA_SUBDIR = 'generated'
+DATASET_PAGE_SIZE = 500
+DATASET_MAX_PAGE_SIZE = 5000
+# A running job's Redis snapshot older than this is checked against the result backend
+STALE_SNAPSHOT_SECONDS = 30
 DEFAULT_RUN_NAME = 'single_table'
 DEFAULT_EPOCHS_VAE = 10
 DEFAULT_EPOCHS_GNN = 10
@@ -66,11 +85,22 @@ def _get_or_create_user_id(request: HttpRequest) -> str:
     return request.session.session_key
 
 
+def _get_user_id_if_any(request: HttpRequest) -> str | None:
+    """
+    Return the session-based user identifier without provisioning a session.
+    Read-only views use this so a first visit does not write a session row.
+    """
+    return request.session.session_key
+
+
 def _get_user_profile(request: HttpRequest) -> dict[str, Any]:
     """
     Create a user profile dict from session for compatibility with existing code.
     """
-    user_id = _get_or_create_user_id(request)
+    return _profile_for_user_id(_get_or_create_user_id(request))
+
+
+def _profile_for_user_id(user_id: str) -> dict[str, Any]:
     return {
         'username': user_id,
         'display_name': f'User-{user_id[:8]}',
@@ -82,6 +112,15 @@ def _get_user_profile(request: HttpRequest) -> dict[str, Any]:
 # Job preparation details captured before launching the pipeline.
 
 
+# (response field, stage profile key) pairs shared by the upload API responses
+_PROFILE_RESPONSE_FIELDS = (
+    ('datasetName', 'dataset_name'),
+    ('tableName', 'table_name'),
+    ('displayDatasetName', 'display_dataset_name'),
+    ('displayTableName', 'display_table_name'),
+)
+
+
 @dataclass
 class PreparedRun:
     params: PipelineParameters
@@ -92,23 +131,71 @@ class PreparedRun:
     started_at: str | None = None
 
 
-def _generated_dir() -> Path:
-    target = Path(settings.MEDIA_ROOT) / MEDIA_SUBDIR
-    target.mkdir(parents=True, exist_ok=True)
-    return target
+@dataclass(frozen=True)
+class FinalizeMetadataRequest:
+    token: str
+    dataset_name: str | None
+    table_name: str | None
+    primary_key: str | None
+    column_overrides: dict[str, dict[str, str]]
 
+    @classmethod
+    def from_json(cls, body: bytes) -> FinalizeMetadataRequest:
+        """Parse and validate a finalize-metadata request body in one pass.
 
-def _metadata_path(token: str) -> Path:
-    return _generated_dir() / f'{token}.json'
+        Raises ``ValueError`` with a client-facing message for malformed input.
+        """
+        try:
+            payload = loads(body)
+        except ValueError:  # covers JSONDecodeError and UnicodeDecodeError
+            raise ValueError('Invalid JSON payload.') from None
+        if not isinstance(payload, dict):
+            raise ValueError('Invalid JSON payload.')
+
+        token = payload.get('token')
+        if not token or not isinstance(token, str):
+            raise ValueError('Missing upload token.')
+
+        column_entries = payload.get('columns') or []
+        if not isinstance(column_entries, list) or not all(isinstance(entry, dict) for entry in column_entries):
+            raise ValueError('Columns must be a list of objects.')
+
+        return cls(
+            token=token,
+            dataset_name=payload.get('datasetName'),
+            table_name=payload.get('tableName'),
+            primary_key=payload.get('primaryKey') or None,
+            column_overrides={
+                str(entry['name']): _column_override(entry)
+                for entry in column_entries
+                if entry.get('name')
+            },
+        )
 
 
-def _data_path(token: str) -> Path:
-    return _generated_dir() / f'{token}.csv'
+# Settings-derived paths are bound once here; request handlers use these
+# instead of going back through the lazy settings object on each call.
+_BASE_DIR = Path(settings.BASE_DIR)
+_RESOLVED_MEDIA_ROOT = Path(settings.MEDIA_ROOT).resolve()
 
 
 def _dataset_table_map() -> dict[str, str]:
+    # Adding or removing a dataset directory bumps the parent's mtime, so it
+    # is a cheap key for reusing the mapping across requests.
+    try:
+        signature: int | None = (DATA_ROOT / 'original').stat().st_mtime_ns
+    except FileNotFoundError:
+        signature = None
+    return dict(_dataset_table_map_for(signature))
+
+
+@lru_cache(maxsize=1)
+def _dataset_table_map_for(signature: int | None) -> dict[str, str]:
+    # A new signature means the dataset directory changed; drop the per-dataset
+    # table lookups too so replaced datasets are re-read.
+    tables_for_dataset.cache_clear()
     mapping: dict[str, str] = {}
-    for dataset_name in sorted(available_datasets()):
+    for dataset_name in available_datasets():
         tables = tables_for_dataset(dataset_name)
         mapping[dataset_name] = tables[0] if tables else dataset_name
     if not mapping:
@@ -116,8 +203,36 @@ def _dataset_table_map() -> dict[str, str]:
     return mapping
 
 
+def _load_metadata(meta_path: Path) -> dict[str, Any]:
+    """Parse a metadata JSON file; the caller owns the returned document."""
+    with open(meta_path, 'rb') as meta_file:
+        return loads(meta_file.read())
+
+
+def _load_metadata_fields(meta_path: Path, stat: os.stat_result | None = None) -> dict[str, Any]:
+    """Return the scalar top-level fields of a metadata file, cached while it is unchanged.
+
+    Most views only need a few of these (dataset, table, row count, log
+    path); the logs, evaluation payload and preview are left out, so the
+    cache stays small and no nested value is shared between requests.
+    Callers that have already stat'ed the file can pass the result along.
+    """
+    if stat is None:
+        stat = meta_path.stat()
+    return dict(_parse_metadata_fields(str(meta_path), stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=256)
+def _parse_metadata_fields(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    return {
+        key: value
+        for key, value in _load_metadata(Path(path)).items()
+        if value is None or isinstance(value, (str, int, float))
+    }
+
+
 def _metadata_template_path(template: str) -> Path:
-    return Path(settings.BASE_DIR) / 'src' / 'data' / 'original' / template / 'metadata.json'
+    return _BASE_DIR / 'src' / 'data' / 'original' / template / 'metadata.json'
 
 
 def _command_for(dataset: str, table_map: dict[str, str], epochs_gnn: int, epochs_vae: int, epochs_diff: int) -> str:
@@ -184,18 +299,19 @@ def _prepare_run_spec(
         metadata_mode = form.cleaned_data.get('metadata_mode')
         metadata_template = form.cleaned_data.get('metadata_template')
 
-        metadata_path: Path | None = None
-        metadata_source: dict[str, Any] = {}
-        table_name: str | None = None
+        # Both branches below assign these, so they never need a None default
+        metadata_path: Path
+        metadata_source: dict[str, Any]
+        table_name: str
 
         if metadata_mode == 'template':
             template_slug = metadata_template or default_dataset
             template_path = _metadata_template_path(template_slug)
-            if not template_path.exists():
+            try:
+                template_payload = _load_metadata(template_path)
+            except FileNotFoundError:
                 form.add_error('metadata_template', 'Selected metadata template is not available.')
                 return None
-            with template_path.open('r', encoding='utf-8') as meta_file:
-                template_payload = json.load(meta_file)
             tables_section = template_payload.get('tables') or {}
             table_name = next(iter(tables_section.keys()), stage.profile['table_name'])
             stage = update_stage_profile(
@@ -230,10 +346,6 @@ def _prepare_run_spec(
         if form.errors:
             return None
 
-        if metadata_path is None or table_name is None:
-            form.add_error(None, 'Metadata could not be resolved for the uploaded dataset.')
-            return None
-
         dataset_name = stage.profile['dataset_name']
         try:
             materialize_to_pipeline(
@@ -292,27 +404,7 @@ def _start_pipeline_job(prepared: PreparedRun) -> str:
         str: Celery task ID (used to track job status)
     """
     # Convert PipelineParameters to dictionary for JSON serialization
-    params_dict = {
-        'dataset': prepared.params.dataset,
-        'table': prepared.params.table,
-        'run_name': prepared.params.run_name,
-        'num_samples': prepared.params.num_samples,
-        'seed': prepared.params.seed,
-        'factor_missing': prepared.params.factor_missing,
-        'positional_enc': prepared.params.positional_enc,
-        'retrain_vae': prepared.params.retrain_vae,
-        'skip_preprocessing': prepared.params.skip_preprocessing,
-        'model_type': prepared.params.model_type,
-        'normalization': prepared.params.normalization,
-        'gnn_hidden': prepared.params.gnn_hidden,
-        'denoising_steps': prepared.params.denoising_steps,
-        'epochs_vae': prepared.params.epochs_vae,
-        'epochs_gnn': prepared.params.epochs_gnn,
-        'epochs_diff': prepared.params.epochs_diff,
-        'enable_epoch_eval': prepared.params.enable_epoch_eval,
-        'eval_frequency': prepared.params.eval_frequency,
-        'eval_samples': prepared.params.eval_samples,
-    }
+    params_dict = asdict(prepared.params)
 
     # Prepare metadata for the task
     prepared_metadata = {
@@ -323,18 +415,43 @@ def _start_pipeline_job(prepared: PreparedRun) -> str:
         'started_at': prepared.started_at or timezone.now().isoformat(),
     }
 
-    # Submit task to Celery
+    # Submit task to Celery by name so the web process never imports the
+    # task module (and with it pandas, scipy and the evaluation stack).
     # The task ID will be used to track job status
-    task = run_pipeline_task.delay(
-        job_token=None,  # Not used anymore, task.id is the job token
-        params_dict=params_dict,
-        prepared_metadata=prepared_metadata,
+    task = current_app.send_task(
+        RUN_PIPELINE_TASK,
+        kwargs={
+            'job_token': None,  # Not used anymore, task.id is the job token
+            'params_dict': params_dict,
+            'prepared_metadata': prepared_metadata,
+        },
     )
 
     # Return the Celery task ID as the job token
     return task.id
 
 
+@lru_cache(maxsize=1)
+def _upload_api_urls() -> dict[str, str]:
+    # The URLconf is static, so these only need resolving once per process.
+    return {
+        'stage': reverse('synthetic:api-stage-upload'),
+        'finalize': reverse('synthetic:api-finalize-metadata'),
+        'start': reverse('synthetic:api-start-run'),
+        'status': reverse('synthetic:api-run-status', kwargs={'token': 'JOB_TOKEN'}),
+        'result': reverse('synthetic:result', kwargs={'token': 'RUN_TOKEN'}),
+    }
+
+
+@lru_cache(maxsize=1)
+def _result_urls() -> dict[str, str]:
+    # Resolved once with a placeholder token that result_view substitutes.
+    return {
+        'download': reverse('synthetic:download', kwargs={'token': 'RUN_TOKEN'}),
+        'download_plot': reverse('synthetic:download-plot', kwargs={'token': 'RUN_TOKEN'}),
+    }
+
+
 def upload_view(request: HttpRequest) -> HttpResponse:
     dataset_map = _dataset_table_map()
     dataset_choices = [(name, name) for name in dataset_map.keys()]
@@ -377,44 +494,10 @@ def upload_view(request: HttpRequest) -> HttpResponse:
         )
 
         if prepared:
-            owner_profile = _get_user_profile(request)
-            prepared.owner = owner_profile
-            prepared.started_at = timezone.now().isoformat()
-            try:
-                pipeline_result, token, generated_rows = _run_pipeline_and_capture(
-                    prepared.params
-                )
-            except PipelineError as exc:
-                form.add_error(None, str(exc))
-            else:
-                finished_at = timezone.now().isoformat()
-                evaluation_payload = evaluate_synthetic_run(
-                    dataset=prepared.params.dataset,
-                    table=prepared.params.table,
-                    synthetic_path=pipeline_result.output_csv,
-                )
-                extra_metadata = dict(prepared.extra_metadata)
-                extra_metadata['evaluation'] = evaluation_payload
-                metadata_payload = _build_run_metadata(
-                    params=prepared.params,
-                    pipeline_result=pipeline_result,
-                    token=token,
-                    generated_rows=generated_rows,
-                    data_source=prepared.data_source,
-                    extra_metadata=extra_metadata,
-                    owner=owner_profile,
-                    started_at=prepared.started_at,
-                    finished_at=finished_at,
-                )
-                _persist_run(
-                    token,
-                    pipeline_result,
-                    metadata_payload,
-                    owner=owner_profile,
-                    started_at=prepared.started_at,
-                    finished_at=finished_at,
-                )
-                return redirect('synthetic:result', token=token)
+            # Run through Celery like api_start_run so the request thread is
+            # not held for the duration of the pipeline.
+            _launch_run(request, prepared)
+            return redirect('synthetic:history')
 
     context = {
         'form': form,
@@ -426,20 +509,14 @@ def upload_view(request: HttpRequest) -> HttpResponse:
             'epochs_gnn': DEFAULT_EPOCHS_GNN,
             'epochs_diff': DEFAULT_EPOCHS_DIFF,
         },
-        'api_urls': {
-            'stage': reverse('synthetic:api-stage-upload'),
-            'finalize': reverse('synthetic:api-finalize-metadata'),
-            'start': reverse('synthetic:api-start-run'),
-            'status': reverse('synthetic:api-run-status', kwargs={'token': 'JOB_TOKEN'}),
-            'result': reverse('synthetic:result', kwargs={'token': 'RUN_TOKEN'}),
-        },
+        'api_urls': _upload_api_urls(),
     }
     return render(request, 'synthetic/upload.html', context)
 
 
 def history_view(request: HttpRequest) -> HttpResponse:
-    user = _get_user_profile(request)
-    username = user.get('username')
+    # A visitor without a session cannot have runs yet; don't create one here.
+    username = _get_user_id_if_any(request)
     runs: list[dict[str, Any]] = []
     error: str | None = None
     active_job_token: str | None = None
@@ -450,14 +527,14 @@ def history_view(request: HttpRequest) -> HttpResponse:
 
     if session_job_token:
         # Check if the Celery task is still running
-        task_result = AsyncResult(session_job_token)
+        job_state, _ = _job_state(session_job_token)
 
-        if task_result.state in ('SUCCESS', 'FAILURE', 'REVOKED'):
+        if job_state in ('SUCCESS', 'FAILURE', 'REVOKED'):
             # Task is done, clear it from session
             del request.session['active_job_token']
             request.session.modified = True
             active_job_token = None
-        elif task_result.state in ('PENDING', 'STARTED', 'PROGRESS'):
+        elif job_state in ('PENDING', 'STARTED', 'PROGRESS'):
             # Task is still running
             active_job_token = session_job_token
         else:
@@ -481,7 +558,7 @@ def history_view(request: HttpRequest) -> HttpResponse:
 
 
 @require_POST
-def api_start_run(request: HttpRequest) -> JsonResponse:
+def api_start_run(request: HttpRequest) -> HttpResponse:
     dataset_map = _dataset_table_map()
     dataset_choices = [(name, name) for name in dataset_map.keys()]
     metadata_templates = dataset_choices
@@ -494,7 +571,7 @@ def api_start_run(request: HttpRequest) -> JsonResponse:
     )
 
     if not form.is_valid():
-        return JsonResponse({'errors': _form_errors(form)}, status=400)
+        return _json_response({'errors': _form_errors(form)}, status=400)
 
     epochs_vae = form.cleaned_data['epochs_vae']
     epochs_gnn = form.cleaned_data['epochs_gnn']
@@ -516,17 +593,9 @@ def api_start_run(request: HttpRequest) -> JsonResponse:
     )
 
     if not prepared:
-        return JsonResponse({'errors': _form_errors(form)}, status=400)
+        return _json_response({'errors': _form_errors(form)}, status=400)
 
-    owner_profile = _get_user_profile(request)
-    prepared.owner = owner_profile
-    prepared.started_at = timezone.now().isoformat()
-
-    # Start the Celery task
-    job_token = _start_pipeline_job(prepared)
-
-    # Store the active job token in session so the history page can track it
-    request.session['active_job_token'] = job_token
+    job_token = _launch_run(request, prepared)
 
     # Return initial task status
     payload: dict[str, Any] = {
@@ -537,34 +606,73 @@ def api_start_run(request: HttpRequest) -> JsonResponse:
         'error': None,
         'resultToken': None,
     }
-    return JsonResponse(payload, status=202)
+    return _json_response(payload, status=202)
+
+
+def _launch_run(request: HttpRequest, prepared: PreparedRun) -> str:
+    """Queue a prepared run for the requesting user and return its job token."""
+    prepared.owner = _get_user_profile(request)
+    prepared.started_at = timezone.now().isoformat()
+    job_token = _start_pipeline_job(prepared)
+    # Store the active job token in session so the history page can track it
+    request.session['active_job_token'] = job_token
+    return job_token
+
+
+def _job_state(token: str) -> tuple[str, Any]:
+    """Return ``(state, info)`` for a job, preferring the Redis status snapshot.
+
+    The task only publishes what it observes itself, so a worker killed by the
+    hard time limit, lost, or revoked leaves a running snapshot behind. A
+    terminal snapshot is trusted as-is; a running one is checked against the
+    result backend once it is older than ``STALE_SNAPSHOT_SECONDS``.
+    """
+    snapshot = read_job_status(token)
+    if snapshot is not None:
+        state = snapshot['state']
+        published_at = snapshot.get('published_at') or 0.0
+        if state in READY_STATES or time.time() - published_at < STALE_SNAPSHOT_SECONDS:
+            return state, snapshot['meta']
+        task_result = AsyncResult(token)
+        if task_result.state in READY_STATES:
+            return task_result.state, task_result.info
+        return state, snapshot['meta']
+    task_result = AsyncResult(token)
+    return task_result.state, task_result.info
 
 
-def api_job_status(request: HttpRequest, token: str) -> JsonResponse:
+def api_job_status(request: HttpRequest, token: str) -> HttpResponse:
     """
     Get the status of a running or completed Celery task.
 
-    This replaces the in-memory job_tracker with Celery's AsyncResult.
+    The task publishes each state change to a Redis snapshot, so a poll is
+    normally a single GET; Celery's AsyncResult is only consulted when no
+    snapshot exists (e.g. Redis is unavailable or the key has expired) or a
+    running snapshot has gone stale.
+
+    Clients that only render progress (e.g. the history page) can pass
+    ``?logs=0`` to skip the log tail and keep each poll response small.
 
     Args:
         request: HTTP request
         token: Celery task ID
 
     Returns:
-        JsonResponse with task status and metadata
+        JSON response with task status and metadata
     """
-    # Get Celery task result
-    task_result = AsyncResult(token)
+    include_logs = request.GET.get('logs') != '0'
+
+    state, info = _job_state(token)
 
     # Check if task exists
-    if task_result.state == 'PENDING' and not task_result.info:
+    if state == 'PENDING' and not info:
         # Task doesn't exist or hasn't been picked up yet
-        return JsonResponse({'error': 'Job not found.'}, status=404)
+        return _json_response({'error': 'Job not found.'}, status=404)
 
     # Build response based on task state
-    if task_result.state == 'PROGRESS':
+    if state == 'PROGRESS':
         # Task is running - get progress metadata
-        meta = task_result.info or {}
+        meta = info or {}
         response_data = {
             'token': token,
             'stage': meta.get('stage', 'running'),
@@ -575,9 +683,9 @@ def api_job_status(request: HttpRequest, token: str) -> JsonResponse:
             'progressPercentage': meta.get('progress', 0),
             'state': 'PROGRESS',
         }
-    elif task_result.state == 'SUCCESS':
+    elif state == 'SUCCESS':
         # Task completed successfully
-        result = task_result.result or {}
+        result = info or {}
         response_data = {
             'token': token,
             'stage': 'completed',
@@ -588,14 +696,14 @@ def api_job_status(request: HttpRequest, token: str) -> JsonResponse:
             'progressPercentage': 100,
             'state': 'SUCCESS',
         }
-    elif task_result.state == 'FAILURE':
+    elif state == 'FAILURE':
         # Task failed
-        meta = task_result.info or {}
+        meta = info or {}
         if isinstance(meta, dict):
-            error_msg = meta.get('error', str(task_result.result))
+            error_msg = meta.get('error', str(info))
             logs = meta.get('logs', [])
         else:
-            error_msg = str(task_result.result)
+            error_msg = str(info)
             logs = []
 
         response_data = {
@@ -608,7 +716,7 @@ def api_job_status(request: HttpRequest, token: str) -> JsonResponse:
             'progressPercentage': 0,
             'state': 'FAILURE',
         }
-    elif task_result.state == 'STARTED':
+    elif state == 'STARTED':
         # Task has started but no progress yet
         response_data = {
             'token': token,
@@ -624,61 +732,46 @@ def api_job_status(request: HttpRequest, token: str) -> JsonResponse:
         # Other states (RETRY, REVOKED, etc.)
         response_data = {
             'token': token,
-            'stage': task_result.state.lower(),
-            'message': task_result.state,
+            'stage': state.lower(),
+            'message': state,
             'logs': [],
             'error': None,
             'resultToken': None,
             'progressPercentage': 0,
-            'state': task_result.state,
+            'state': state,
         }
 
-    response = JsonResponse(response_data)
+    if not include_logs:
+        response_data.pop('logs', None)
+
+    response = _json_response(response_data)
     response['Cache-Control'] = 'no-store'
     return response
 
 
+def _json_response(payload: dict[str, Any], *, status: int = 200) -> HttpResponse:
+    """Like JsonResponse, but encoded with orjson when it is installed."""
+    return HttpResponse(dumps_bytes(payload), status=status, content_type='application/json')
+
+
 def _form_errors(form: SyntheticDataForm) -> dict[str, list[str]]:
-    errors: dict[str, list[str]] = {}
-    for field, entries in form.errors.get_json_data().items():
-        errors[field] = [entry['message'] for entry in entries]
-    return errors
+    # Iterating a ValidationError yields its rendered messages, which is what
+    # get_json_data() would produce without building the per-error dicts.
+    return {
+        field: [message for error in errors for message in error]
+        for field, errors in form.errors.as_data().items()
+    }
 
 
-def _load_epoch_metrics(dataset: str, table: str, run_name: str) -> dict[str, Any] | None:
+def _load_epoch_metrics(most_recent: Path) -> dict[str, Any] | None:
     """
-    Load epoch-wise evaluation metrics from training logs.
+    Load epoch-wise evaluation metrics from a training log.
 
     Returns dict with metrics_history or None if not found.
     """
-    import glob
-
-    # Construct the expected log directory
-    logs_dir = Path(settings.BASE_DIR) / 'logs' / 'training_metrics'
-    if not logs_dir.exists():
-        return None
-
-    # Build search pattern for this dataset/table/run
-    table_factor = f"{table}_factor" if not table.endswith('_factor') else table
-    search_pattern = f"{dataset}_{table_factor}_{run_name}_*.json"
-
-    # Find matching log files
-    matching_files = list(logs_dir.glob(search_pattern))
-
-    if not matching_files:
-        # Try without _factor suffix
-        search_pattern_alt = f"{dataset}_{table}_{run_name}_*.json"
-        matching_files = list(logs_dir.glob(search_pattern_alt))
-
-    if not matching_files:
-        return None
-
-    # Use the most recent file
-    most_recent = max(matching_files, key=lambda p: p.stat().st_mtime)
-
     try:
-        with open(most_recent, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(most_recent, 'rb') as f:
+            data = loads(f.read())
 
         metrics_history = data.get('metrics_history', [])
         if not metrics_history:
@@ -698,25 +791,108 @@ def _load_epoch_metrics(dataset: str, table: str, run_name: str) -> dict[str, An
         return None
 
 
+@lru_cache(maxsize=64)
+def _epoch_metrics_summary(path: str, mtime_ns: int, size: int) -> dict[str, Any] | None:
+    """Epoch metrics of a log without the history, reused while the log is unchanged.
+
+    The result page only shows these fields; the history itself is served
+    by api_epoch_metrics_view.
+    """
+    epoch_metrics = _load_epoch_metrics(Path(path))
+    if epoch_metrics:
+        epoch_metrics.pop('metrics_history', None)
+    return epoch_metrics
+
+
+def _run_epoch_metrics_log(metadata: dict[str, Any]) -> Path | None:
+    """Epoch-metrics log of a persisted run.
+
+    The path recorded in the metadata when the run was persisted is used;
+    without it the logs directory is searched.
+    """
+    dataset = metadata.get('dataset')
+    table = metadata.get('table')
+    if not dataset or not table:
+        return None
+    log_file = metadata.get('epoch_metrics_log')
+    if log_file:
+        return Path(log_file)
+    return epoch_metrics_log_path(dataset, table, metadata.get('run_name', 'single_table'))
+
+
+def _run_epoch_metrics(metadata: dict[str, Any]) -> dict[str, Any] | None:
+    """Epoch metrics for a persisted run, or None when it has none."""
+    log_path = _run_epoch_metrics_log(metadata)
+    return _load_epoch_metrics(log_path) if log_path is not None else None
+
+
+def _result_template_revision() -> str:
+    template_dir = _BASE_DIR / 'templates'
+    paths = (template_dir / 'base.html', template_dir / 'synthetic' / 'result.html')
+    return format(max(path.stat().st_mtime_ns for path in paths if path.exists()), 'x')
+
+
+# Templates only change on deploy outside development
+_cached_result_template_revision = lru_cache(maxsize=1)(_result_template_revision)
+
+
+def _stat_part(stat: os.stat_result | None) -> str:
+    return f'{stat.st_mtime_ns:x}-{stat.st_size:x}' if stat is not None else '0'
+
+
+def _result_etag(
+    meta_stat: os.stat_result,
+    csv_stat: os.stat_result | None,
+    log_stat: os.stat_result | None,
+) -> str:
+    """Validator for the result page: it only changes when the run's files or the templates do."""
+    revision = _result_template_revision() if settings.DEBUG else _cached_result_template_revision()
+    return f'"{revision}-{_stat_part(meta_stat)}-{_stat_part(csv_stat)}-{_stat_part(log_stat)}"'
+
+
+def _optional_stat(path: Path | None) -> os.stat_result | None:
+    if path is None:
+        return None
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
 def result_view(request: HttpRequest, token: str) -> HttpResponse:
-    csv_path = _data_path(token)
-    meta_path = _metadata_path(token)
-    if not meta_path.exists():
+    csv_path = run_data_path(token)
+    meta_path = run_metadata_path(token)
+    try:
+        meta_stat = meta_path.stat()
+    except FileNotFoundError:
         raise Http404('Synthetic run metadata not found.')
+    csv_stat = _optional_stat(csv_path)
+    epoch_log = _run_epoch_metrics_log(_load_metadata_fields(meta_path, meta_stat))
 
-    with open(meta_path, 'r', encoding='utf-8') as meta_file:
-        metadata = json.load(meta_file)
+    # A reload of an unchanged run is answered with 304 before anything is
+    # read from the CSV or the epoch log, or rendered
+    log_stat = _optional_stat(epoch_log)
+    etag = _result_etag(meta_stat, csv_stat, log_stat)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        # Without a response to copy from, Django leaves the validator off the 304
+        not_modified['ETag'] = etag
+        return not_modified
+
+    metadata = _load_metadata(meta_path)
 
     preview_headers: list[str] = []
     preview_rows: list[list[str]] = []
     generated_rows: int | None = metadata.get('generated_rows')
-    has_csv = csv_path.exists()
+    has_csv = csv_stat is not None
     if has_csv:
-        df = pd.read_csv(csv_path)
-        generated_rows = int(len(df))
-        preview = df.head(20)
-        preview_headers = preview.columns.tolist()
-        preview_rows = preview.fillna('').astype(str).values.tolist()
+        # Runs persisted with a cached preview don't need the CSV opened at all
+        preview_headers = metadata.get('preview_headers')
+        preview_rows = metadata.get('preview_rows')
+        if preview_headers is None or preview_rows is None:
+            preview_headers, preview_rows = read_csv_rows(csv_path, 0, PREVIEW_ROWS)
+        if generated_rows is None:
+            generated_rows = count_csv_rows(csv_path)
 
     metadata['generated_rows'] = generated_rows
 
@@ -739,24 +915,23 @@ def result_view(request: HttpRequest, token: str) -> HttpResponse:
         evaluation_plot_data_uri = plot_payload.get('data_uri')
         evaluation_plot_path = plot_payload.get('path')
         if evaluation_plot_path:
-            evaluation_download_url = reverse('synthetic:download-plot', kwargs={'token': token})
-
-        # Get UMAP coordinates for interactive visualization
-        umap_coords = evaluation.get('umap_coordinates')
-        if umap_coords:
-            umap_coordinates = json.dumps(umap_coords)
-
-    # Load epoch evaluation data if available
-    epoch_metrics_data: dict[str, Any] | None = None
-    epoch_metrics_json: str | None = None
-    dataset = metadata.get('dataset')
-    table = metadata.get('table')
-    run_name = metadata.get('run_name', 'single_table')
-    if dataset and table:
-        epoch_metrics_data = _load_epoch_metrics(dataset, table, run_name)
-        if epoch_metrics_data:
-            # Serialize metrics_history to JSON for JavaScript
-            epoch_metrics_json = json.dumps(epoch_metrics_data.get('metrics_history', []))
+            evaluation_download_url = _result_urls()['download_plot'].replace('RUN_TOKEN', token)
+
+        # Get UMAP coordinates for interactive visualization; runs persisted
+        # since the pre-encoded field was added skip the re-serialization.
+        umap_coordinates = evaluation.get('umap_coordinates_json')
+        if umap_coordinates is None:
+            umap_coords = evaluation.get('umap_coordinates')
+            if umap_coords:
+                umap_coordinates = dumps(umap_coords)
+
+    # Load epoch evaluation data if available. The chart data itself is served
+    # by api_epoch_metrics_view; the page only needs the summary fields.
+    epoch_metrics_data = (
+        _epoch_metrics_summary(str(epoch_log), log_stat.st_mtime_ns, log_stat.st_size)
+        if log_stat is not None
+        else None
+    )
 
     context = {
         'metadata': metadata,
@@ -764,7 +939,7 @@ def result_view(request: HttpRequest, token: str) -> HttpResponse:
         'preview_headers': preview_headers,
         'preview_rows': preview_rows,
         'has_output': has_csv,
-        'download_url': request.build_absolute_uri(reverse('synthetic:download', kwargs={'token': token})) if has_csv else None,
+        'download_url': request.build_absolute_uri(_result_urls()['download'].replace('RUN_TOKEN', token)) if has_csv else None,
         'evaluation': evaluation,
         'evaluation_headers': evaluation_headers,
         'evaluation_rows': evaluation_rows,
@@ -773,32 +948,60 @@ def result_view(request: HttpRequest, token: str) -> HttpResponse:
         'evaluation_download_url': evaluation_download_url,
         'umap_coordinates': umap_coordinates,
         'epoch_metrics': epoch_metrics_data,
-        'epoch_metrics_json': epoch_metrics_json,
     }
-    return render(request, 'synthetic/result.html', context)
+    response = render(request, 'synthetic/result.html', context)
+    response['ETag'] = etag
+    return response
 
 
-def download_view(request: HttpRequest, token: str) -> FileResponse:
-    csv_path = _data_path(token)
-    meta_path = _metadata_path(token)
-    if not csv_path.exists() or not meta_path.exists():
-        raise Http404('Synthetic dataset not found.')
+def _accel_redirect_uri(path: Path) -> str | None:
+    """Internal nginx URI for a file under MEDIA_ROOT, when X-Accel-Redirect is enabled."""
+    prefix = settings.X_ACCEL_REDIRECT_PREFIX
+    if not prefix:
+        return None
+    try:
+        relative = path.resolve().relative_to(_RESOLVED_MEDIA_ROOT)
+    except ValueError:
+        return None
+    return f"{prefix.rstrip('/')}/{quote(relative.as_posix())}"
+
 
-    with open(meta_path, 'r', encoding='utf-8') as meta_file:
-        metadata = json.load(meta_file)
+def _attachment_response(path: Path, filename: str, missing_message: str) -> HttpResponse:
+    """Serve ``path`` as a download, handing the transfer to nginx when configured."""
+    accel_uri = _accel_redirect_uri(path)
+    if accel_uri is None:
+        # Opening the file doubles as its existence check
+        try:
+            handle = open(path, 'rb', buffering=0)
+        except FileNotFoundError:
+            raise Http404(missing_message)
+        return FileResponse(handle, as_attachment=True, filename=filename)
+
+    if not path.is_file():
+        raise Http404(missing_message)
+    response = HttpResponse(content_type=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+    response['X-Accel-Redirect'] = accel_uri
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
+
+
+def download_view(request: HttpRequest, token: str) -> HttpResponse:
+    try:
+        metadata = _load_metadata_fields(run_metadata_path(token))
+    except FileNotFoundError:
+        raise Http404('Synthetic dataset not found.')
 
     filename = f"{metadata.get('dataset')}_{metadata.get('table')}_{metadata.get('run_name', token)}.csv"
-    return FileResponse(csv_path.open('rb'), as_attachment=True, filename=filename)
+    return _attachment_response(run_data_path(token), filename, 'Synthetic dataset not found.')
 
 
-def download_plot(request: HttpRequest, token: str) -> FileResponse:
-    meta_path = _metadata_path(token)
-    if not meta_path.exists():
+def download_plot(request: HttpRequest, token: str) -> HttpResponse:
+    meta_path = run_metadata_path(token)
+    try:
+        metadata = _load_metadata(meta_path)
+    except FileNotFoundError:
         raise Http404('Synthetic run metadata not found.')
 
-    with open(meta_path, 'r', encoding='utf-8') as meta_file:
-        metadata = json.load(meta_file)
-
     plot_payload = metadata.get('evaluation', {}).get('plot', {})
     plot_path_str = plot_payload.get('path')
     if not plot_path_str:
@@ -806,113 +1009,135 @@ def download_plot(request: HttpRequest, token: str) -> FileResponse:
 
     plot_path = Path(plot_path_str)
     if not plot_path.is_absolute():
-        plot_path = Path(settings.BASE_DIR) / plot_path
-    if not plot_path.exists():
-        raise Http404('UMAP plot file not found.')
+        plot_path = _BASE_DIR / plot_path
+    return _attachment_response(plot_path, plot_path.name, 'UMAP plot file not found.')
 
-    filename = plot_path.name
-    return FileResponse(plot_path.open('rb'), as_attachment=True, filename=filename)
 
+@gzip_page
+def api_dataset_view(request: HttpRequest, token: str) -> HttpResponse:
+    """API endpoint to serve a page of the dataset for a given run token.
 
-def api_dataset_view(request: HttpRequest, token: str) -> JsonResponse:
-    """API endpoint to serve the full dataset for a given run token."""
-    csv_path = _data_path(token)
-    meta_path = _metadata_path(token)
+    Accepts ``cursor``, ``offset`` and ``limit`` query parameters. Each
+    response carries ``next_cursor``; passing it back resumes reading at that
+    byte position, so paging through the whole file parses each row once.
+    """
+    csv_path = run_data_path(token)
+    meta_path = run_metadata_path(token)
 
-    if not csv_path.exists() or not meta_path.exists():
-        return JsonResponse({'error': 'Dataset not found.'}, status=404)
+    try:
+        meta_stat = meta_path.stat()
+        csv_stat = csv_path.stat()
+    except FileNotFoundError:
+        return _json_response({'error': 'Dataset not found.'}, status=404)
+
+    offset = _safe_int(request.GET.get('offset'), 0)
+    cursor = _safe_int(request.GET.get('cursor'), 0)
+    limit = min(_safe_int(request.GET.get('limit'), DATASET_PAGE_SIZE), DATASET_MAX_PAGE_SIZE)
+    if cursor and not _is_row_boundary(csv_path, cursor, csv_stat.st_size):
+        return _json_response({'error': 'Invalid cursor.'}, status=400)
 
     try:
-        # Read the CSV file
-        df = pd.read_csv(csv_path)
+        headers, rows, next_cursor = _read_csv_page(csv_path, limit, offset=offset, cursor=cursor)
 
-        # Convert to list of lists for JSON serialization
-        headers = df.columns.tolist()
-        rows = df.fillna('').astype(str).values.tolist()
+        total_rows = _load_metadata_fields(meta_path, meta_stat).get('generated_rows')
+        if total_rows is None:
+            total_rows = count_csv_rows(csv_path)
 
         response_data = {
             'headers': headers,
             'rows': rows,
-            'total_rows': len(rows)
+            'offset': offset,
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'total_rows': total_rows,
         }
 
-        return JsonResponse(response_data)
+        return _json_response(response_data)
 
-    except Exception as e:
-        return JsonResponse({'error': f'Failed to load dataset: {str(e)}'}, status=500)
+    except Exception:
+        logger.exception('Failed to load dataset page for run %s', token)
+        return _json_response({'error': 'Failed to load dataset.'}, status=500)
+
+
+def api_epoch_metrics_view(request: HttpRequest, token: str) -> HttpResponse:
+    """Epoch-wise metrics history for the result page's training charts."""
+    try:
+        metadata = _load_metadata_fields(run_metadata_path(token))
+    except FileNotFoundError:
+        return _json_response({'error': 'Run not found.'}, status=404)
+
+    epoch_metrics_data = _run_epoch_metrics(metadata)
+    if not epoch_metrics_data:
+        return _json_response({'error': 'Epoch metrics not available for this run.'}, status=404)
+
+    response = HttpResponse(
+        dumps_bytes(epoch_metrics_data['metrics_history']),
+        content_type='application/json',
+    )
+    response['Cache-Control'] = 'private, max-age=60'
+    return response
 
 
 @require_POST
-def api_stage_upload(request: HttpRequest) -> JsonResponse:
+def api_stage_upload(request: HttpRequest) -> HttpResponse:
     upload = request.FILES.get('dataset')
     if upload is None:
-        return JsonResponse({'error': 'No dataset provided.'}, status=400)
+        return _json_response({'error': 'No dataset provided.'}, status=400)
     dataset_name = request.POST.get('datasetName')
     table_name = request.POST.get('tableName')
     try:
         stage = stage_upload(upload, dataset_name=dataset_name, table_name=table_name)
     except ValueError as exc:
-        return JsonResponse({'error': str(exc)}, status=400)
+        return _json_response({'error': str(exc)}, status=400)
     except Exception:
-        return JsonResponse({'error': 'Failed to process uploaded file.'}, status=500)
-    payload = {
-        'token': stage.token,
-        'datasetName': stage.profile['dataset_name'],
-        'tableName': stage.profile['table_name'],
-        'displayDatasetName': stage.profile.get('display_dataset_name'),
-        'displayTableName': stage.profile.get('display_table_name'),
-        'rowCount': stage.profile['row_count'],
-        'columns': stage.profile['columns'],
-        'sourceFilename': stage.profile['source_filename'],
-    }
-    return JsonResponse(payload)
+        return _json_response({'error': 'Failed to process uploaded file.'}, status=500)
+    profile = stage.profile
+    payload = {'token': stage.token}
+    payload.update({field: profile.get(key) for field, key in _PROFILE_RESPONSE_FIELDS})
+    payload['rowCount'] = profile['row_count']
+    payload['columns'] = profile['columns']
+    payload['sourceFilename'] = profile['source_filename']
+    return _json_response(payload)
 
 
 @require_POST
-def api_finalize_metadata(request: HttpRequest) -> JsonResponse:
+def api_finalize_metadata(request: HttpRequest) -> HttpResponse:
     try:
-        payload = json.loads(request.body.decode('utf-8'))
-    except (json.JSONDecodeError, UnicodeDecodeError):
-        return JsonResponse({'error': 'Invalid JSON payload.'}, status=400)
-
-    token = payload.get('token')
-    if not token:
-        return JsonResponse({'error': 'Missing upload token.'}, status=400)
-
-    dataset_name = payload.get('datasetName')
-    table_name = payload.get('tableName')
-    primary_key = payload.get('primaryKey')
-    column_entries = payload.get('columns') or []
+        finalize = FinalizeMetadataRequest.from_json(request.body)
+    except ValueError as exc:
+        return _json_response({'error': str(exc)}, status=400)
 
     try:
-        stage = update_stage_profile(token, dataset_name=dataset_name, table_name=table_name)
+        stage = update_stage_profile(
+            finalize.token,
+            dataset_name=finalize.dataset_name,
+            table_name=finalize.table_name,
+        )
     except FileNotFoundError:
-        return JsonResponse({'error': 'Upload session not found.'}, status=404)
-
-    column_overrides: dict[str, dict[str, str]] = {}
-    for entry in column_entries:
-        name = entry.get('name')
-        if not name:
-            continue
-        override: dict[str, str] = {}
-        kind = entry.get('kind')
-        if kind:
-            override['kind'] = str(kind)
-        if entry.get('representation') is not None:
-            override['representation'] = str(entry['representation'])
-        column_overrides[str(name)] = override
-
-    metadata = build_metadata_from_profile(stage, primary_key=primary_key or None, column_overrides=column_overrides)
-    metadata_path = save_metadata(token, metadata)
-
-    response = {
-        'metadataPath': str(metadata_path),
-        'datasetName': stage.profile['dataset_name'],
-        'tableName': stage.profile['table_name'],
-        'displayDatasetName': stage.profile.get('display_dataset_name'),
-        'displayTableName': stage.profile.get('display_table_name'),
-    }
-    return JsonResponse(response)
+        return _json_response({'error': 'Upload session not found.'}, status=404)
+
+    metadata = build_metadata_from_profile(
+        stage,
+        primary_key=finalize.primary_key,
+        column_overrides=finalize.column_overrides,
+    )
+    metadata_path = save_metadata(finalize.token, metadata)
+
+    profile = stage.profile
+    response = {'metadataPath': str(metadata_path)}
+    response.update({field: profile.get(key) for field, key in _PROFILE_RESPONSE_FIELDS})
+    return _json_response(response)
+
+
+def _column_override(entry: dict[str, Any]) -> dict[str, str]:
+    override: dict[str, str] = {}
+    kind = entry.get('kind')
+    if kind:
+        override['kind'] = str(kind)
+    representation = entry.get('representation')
+    if representation is not None:
+        override['representation'] = str(representation)
+    return override
 
 
 def _safe_int(value: Any, fallback: int) -> int:
@@ -923,96 +1148,41 @@ def _safe_int(value: Any, fallback: int) -> int:
         return fallback
 
 
-def _run_pipeline_and_capture(
-    params: PipelineParameters, *, status_callback=None
-) -> tuple[Any, str, int | None]:
-    pipeline_result = execute_pipeline(params, status_callback=status_callback)
-    token = uuid4().hex
-    generated_rows = None
-    if pipeline_result.output_csv is not None:
-        df = pd.read_csv(pipeline_result.output_csv)
-        generated_rows = int(len(df))
-    return pipeline_result, token, generated_rows
-
-
-
-def _build_run_metadata(
+def _read_csv_page(
+    csv_path: Path | str,
+    limit: int,
     *,
-    params: PipelineParameters,
-    pipeline_result: Any,
-    token: str,
-    generated_rows: int | None,
-    data_source: str,
-    extra_metadata: dict[str, Any] | None = None,
-    owner: dict[str, Any] | None = None,
-    started_at: str | None = None,
-    finished_at: str | None = None,
-) -> dict[str, Any]:
-    requested_at = started_at or timezone.now().isoformat()
-    metadata = {
-        'token': token,
-        'dataset': params.dataset,
-        'table': params.table,
-        'run_name': params.run_name,
-        'requested_at': requested_at,
-        'started_at': started_at or requested_at,
-        'finished_at': finished_at,
-        'num_samples': params.num_samples,
-        'random_seed': params.seed,
-        'factor_missing': params.factor_missing,
-        'positional_enc': params.positional_enc,
-        'retrain_vae': params.retrain_vae,
-        'skip_preprocessing': params.skip_preprocessing,
-        'model_type': params.model_type,
-        'normalization': params.normalization,
-        'gnn_hidden': params.gnn_hidden,
-        'denoising_steps': params.denoising_steps,
-        'epochs_vae': params.epochs_vae,
-        'epochs_gnn': params.epochs_gnn,
-        'epochs_diff': params.epochs_diff,
-        'generated_rows': generated_rows,
-        'data_source': data_source,
-        'log_file': str(pipeline_result.log_path) if pipeline_result.log_path else None,
-        'output_csv': str(pipeline_result.output_csv) if pipeline_result.output_csv else None,
-        'logs': [
-            {
-                'description': command.description,
-                'command': command.command,
-                'output': command.output,
-            }
-            for command in pipeline_result.commands
-        ],
-    }
-    if owner:
-        metadata['owner'] = {
-            'username': owner.get('username'),
-            'email': owner.get('email'),
-            'full_name': owner.get('full_name') or owner.get('name') or owner.get('username'),
-            'roles': owner.get('roles', []),
-        }
-        metadata['owner_username'] = owner.get('username')
-    if extra_metadata:
-        metadata.update(extra_metadata)
-    return metadata
-    if extra_metadata:
-        metadata.update(extra_metadata)
-    return metadata
-
-def _persist_run(
-    token: str,
-    pipeline_result: Any,
-    metadata: dict[str, Any],
-    *,
-    owner: dict[str, Any] | None = None,
-    started_at: str | None = None,
-    finished_at: str | None = None,
-) -> None:
-    if pipeline_result.output_csv is not None:
-        csv_target = _data_path(token)
-        csv_target.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(pipeline_result.output_csv, csv_target)
-    metadata.setdefault('started_at', started_at)
-    metadata.setdefault('finished_at', finished_at)
-    with open(_metadata_path(token), 'w', encoding='utf-8') as meta_file:
-        json.dump(metadata, meta_file, indent=2)
-    store_run_history(metadata, owner=owner, started_at=metadata.get('started_at'), finished_at=metadata.get('finished_at'))
+    offset: int = 0,
+    cursor: int = 0,
+) -> tuple[list[str], list[list[str]], int | None]:
+    """Return the header, up to ``limit`` data rows and the cursor of the next page.
+
+    The cursor is the byte position just past the last returned row, so a
+    client paging through the file seeks straight to its next row instead of
+    re-parsing every row before it. ``offset`` rows are skipped after the
+    cursor. The next cursor is None once the file is exhausted.
+    """
+    with open(csv_path, 'rb') as stream:
+        reader = filter(None, csv.reader(_decoded_lines(stream)))
+        headers = next(reader, [])
+        # csv.reader only pulls the lines of the row it is building, so the
+        # stream position always sits on a row boundary between rows.
+        if cursor > stream.tell():
+            stream.seek(cursor)
+        rows = list(islice(reader, offset, offset + limit))
+        next_cursor = stream.tell() if len(rows) == limit else None
+    return headers, rows, next_cursor
+
+
+def _is_row_boundary(csv_path: Path, cursor: int, size: int) -> bool:
+    """Whether ``cursor`` can be a ``next_cursor``: inside the file and just after a newline."""
+    if not 0 < cursor <= size:
+        return False
+    with open(csv_path, 'rb') as stream:
+        stream.seek(cursor - 1)
+        return stream.read(1) == b'\n'
+
+
+def _decoded_lines(stream: BinaryIO) -> Iterator[str]:
+    for line in iter(stream.readline, b''):
+        yield line.decode('utf-8')
@@ -28,9 +28,9 @@ app = Celery('tabgraphsyn')
 # - namespace='CELERY' means all celery-related settings must be prefixed with 'CELERY_'
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
-# Auto-discover tasks from all installed Django apps
-# This will look for tasks.py in each app directory
-app.autodiscover_tasks()
+# Only the synthetic app defines tasks; naming it skips probing every other
+# installed app for a tasks module each time a worker boots.
+app.autodiscover_tasks(['synthetic'])
 
 # Configure Celery to use django-celery-results for storing task results
 app.conf.update(
@@ -28,7 +28,7 @@ DEBUG = os.getenv('DEBUG', 'False').lower() in ('true', '1', 't', 'yes')
 
 # ALLOWED_HOSTS: Parse comma-separated list from environment
 ALLOWED_HOSTS_ENV = os.getenv('ALLOWED_HOSTS', '127.0.0.1,localhost')
-ALLOWED_HOSTS: list[str] = [host.strip() for host in ALLOWED_HOSTS_ENV.split(',') if host.strip()]
+ALLOWED_HOSTS: list[str] = [host for host in map(str.strip, ALLOWED_HOSTS_ENV.split(',')) if host]
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -44,6 +44,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,11 +76,44 @@ WSGI_APPLICATION = 'tabgraphsyn_site.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # Django's SQLite backend plus per-connection PRAGMAs (tabgraphsyn_site/sqlite)
+        'ENGINE': 'tabgraphsyn_site.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests instead of reconnecting each time
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Seconds a connection waits on a locked database before erroring;
+            # the Celery result backend writes here while the web workers read.
+            'timeout': 20,
+            # WAL lets readers proceed while a writer commits, and NORMAL sync
+            # only fsyncs at checkpoints, which is safe in WAL mode.
+            'pragmas': (
+                'PRAGMA journal_mode=WAL',
+                'PRAGMA synchronous=NORMAL',
+                'PRAGMA temp_store=MEMORY',
+            ),
+        },
     }
 }
 
+# Sessions are read through the cache and only fall back to the database on a
+# miss. Signed-cookie sessions don't fit: the session key doubles as the
+# anonymous owner id for runs, and it must not change when the data does.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Shared Redis cache (e.g. redis://localhost:6379/1). Without it each worker
+# process keeps its own in-memory cache, so session reads that land on a
+# different gunicorn worker still go to SQLite.
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -110,18 +144,29 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / 'staticfiles'  # For production: python manage.py collectstatic
 
+# WhiteNoise (see MIDDLEWARE) lets gunicorn serve STATIC_ROOT itself: files are
+# gzip/brotli-compressed once at collectstatic time, and the manifest storage
+# gives them content-hashed names so they are sent with far-future cache
+# headers instead of being read and compressed per request.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+
 # Media files (user uploads)
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# When set (e.g. '/protected/'), downloads of files under MEDIA_ROOT are handed
+# to nginx with X-Accel-Redirect instead of being streamed by Django. nginx needs
+# an `internal` location that maps this prefix onto MEDIA_ROOT.
+X_ACCEL_REDIRECT_PREFIX = os.getenv('X_ACCEL_REDIRECT_PREFIX', '')
 
 # CSRF Trusted Origins - Build from ALLOWED_HOSTS
 # Add https:// prefix for production hosts, http:// for localhost
-CSRF_TRUSTED_ORIGINS = []
-for host in ALLOWED_HOSTS:
-    if host in ('127.0.0.1', 'localhost'):
-        CSRF_TRUSTED_ORIGINS.append(f'http://{host}')
-    else:
-        CSRF_TRUSTED_ORIGINS.append(f'https://{host}')
+CSRF_TRUSTED_ORIGINS = [
+    f'http://{host}' if host in ('127.0.0.1', 'localhost') else f'https://{host}'
+    for host in ALLOWED_HOSTS
+]
 MONGO_CONNECTION = {
     'URI': os.getenv('TABGRAPHSYN_MONGO_URI', 'mongodb://localhost:27017'),
     'DATABASE': os.getenv('TABGRAPHSYN_MONGO_DB', 'tabgraphsyn'),
@@ -129,9 +174,11 @@ MONGO_CONNECTION = {
     'RUNS_COLLECTION': os.getenv('TABGRAPHSYN_MONGO_RUNS_COLLECTION', 'runs'),
 }
 
-PIPELINE_PYTHON_EXECUTABLE = (
-    os.getenv('TABGRAPHSYN_PIPELINE_PYTHON')
-    or r'C:\ProgramData\miniconda3\envs\tabgraphsyn\python.exe'
+# Interpreter used to run the pipeline scripts. The conda path is the default
+# on Windows development machines; elsewhere, leaving this unset runs the
+# pipeline with the web/worker interpreter itself.
+PIPELINE_PYTHON_EXECUTABLE = os.getenv('TABGRAPHSYN_PIPELINE_PYTHON') or (
+    r'C:\ProgramData\miniconda3\envs\tabgraphsyn\python.exe' if os.name == 'nt' else None
 )
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -162,7 +209,9 @@ if not DEBUG:
 # File Upload Security
 # Maximum upload file size: 100 MB (100 * 1024 * 1024 bytes)
 DATA_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100 MB in bytes
-FILE_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100 MB in bytes
+# Files above this size are spooled to a temp file on disk instead of RAM;
+# staging then renames the temp file into place rather than copying it.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5 MB in bytes
 
 # =============================================================================
 # Celery Configuration (Task Queue for Background Jobs)
@@ -185,3 +234,7 @@ CELERY_TASK_SOFT_TIME_LIMIT = int(os.getenv('CELERY_TASK_SOFT_TIME_LIMIT', '7000
 
 # Task result expiration (results deleted after this many seconds)
 CELERY_RESULT_EXPIRES = 86400  # 24 hours
+
+# Pipelines running at once per worker; further runs wait in the broker queue
+# instead of all training in parallel (Celery's default is one per CPU core).
+CELERY_WORKER_CONCURRENCY = int(os.getenv('PIPELINE_MAX_CONCURRENT', '2'))
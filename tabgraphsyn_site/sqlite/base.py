@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite backend that runs ``OPTIONS['pragmas']`` on every new connection.
+
+    Django 4.2 passes the remaining OPTIONS straight to ``sqlite3.connect``,
+    which has no way to set pragmas, so they are taken out here.
+    """
+
+    def get_connection_params(self) -> dict[str, Any]:
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        return params
+
+    def get_new_connection(self, conn_params: dict[str, Any]) -> Any:
+        conn = super().get_new_connection(conn_params)
+        for pragma in self.settings_dict['OPTIONS'].get('pragmas', ()):
+            conn.execute(pragma)
+        return conn
@@ -1,13 +1,22 @@
 #!/usr/bin/env python
 """Quick script to test Redis connection"""
-import redis
-
-try:
-    r = redis.Redis(host='localhost', port=6379, db=0)
-    result = r.ping()
-    print("✅ Redis is running! Connection successful.")
-    print(f"Ping response: {result}")
-except redis.exceptions.ConnectionError as e:
-    print("❌ Redis is NOT running!")
-    print(f"Error: {e}")
-    print("\nPlease start Redis using one of the methods above.")
+
+
+def main() -> None:
+    # Imported here so collecting this file (it matches test_*.py) neither
+    # loads redis nor opens a connection.
+    import redis
+
+    try:
+        r = redis.Redis(host='localhost', port=6379, db=0, socket_connect_timeout=1)
+        result = r.ping()
+        print("✅ Redis is running! Connection successful.")
+        print(f"Ping response: {result}")
+    except redis.exceptions.ConnectionError as e:
+        print("❌ Redis is NOT running!")
+        print(f"Error: {e}")
+        print("\nPlease start Redis using one of the methods above.")
+
+
+if __name__ == '__main__':
+    main()